@@ -7,7 +7,73 @@ initialize a PandaArch class for the specified architecture in the variable
 
 '''
 import binascii
-from .utils import telescope
+import struct
+import sys
+from .utils import telescope_str
+
+_DUMP_STACK_SRC = '''
+def _dump_stack(self, cpu, words=8):
+    base_reg_s = "SP"
+    base_reg_val = self.get_reg(cpu, self.reg_sp)
+    if base_reg_val == 0:
+        print("[WARNING: no stack pointer]")
+        return
+    memory_read = self.panda.virtual_memory_read
+    describe = telescope_str
+    vals = None
+    try:
+        block = memory_read(cpu, base_reg_val, words*{ws})
+        vals = _unpack8(block) if words == 8 else struct.unpack("{ec}%d{wc}" % words, block)
+    except ValueError:
+        pass
+    parts = []
+    if vals is not None:
+        for word_idx, val in enumerate(vals):
+            parts.append("[{{}}+0x{{:0>2x}}] == 0x{{:0<8x}}]: 0x{{:0<8x}}\\t{{}}".format(base_reg_s, word_idx*{ws}, base_reg_val+word_idx*{ws}, val, describe(self.panda, cpu, val)))
+    else:
+        for word_idx in range(words):
+            try:
+                val_b = memory_read(cpu, base_reg_val+word_idx*{ws}, {ws})
+                val = int.from_bytes(val_b, byteorder="{endianness}")
+                parts.append("[{{}}+0x{{:0>2x}}] == 0x{{:0<8x}}]: 0x{{:0<8x}}\\t{{}}".format(base_reg_s, word_idx*{ws}, base_reg_val+word_idx*{ws}, val, describe(self.panda, cpu, val)))
+            except ValueError:
+                parts.append("[{{}}+0x{{:0>2x}}] == [memory read error]\\n".format(base_reg_s, word_idx*{ws}))
+    sys.stdout.write("".join(parts))
+'''
+
+_dump_stack_printers = {}
+
+def _make_dump_stack_printer(word_size, endianness):
+    '''
+    Runtime-generate a dump_stack implementation specialized for one
+    (word size, endianness) pair. Baking the constants into the
+    generated bytecode avoids the per-call format dispatch of a generic
+    loop; the function is built once per combination and shared.
+    '''
+    key = (word_size, endianness)
+    fn = _dump_stack_printers.get(key)
+    if fn is None:
+        ec = '<' if endianness == 'little' else '>'
+        wc = 'Q' if word_size == 8 else 'I'
+        src = _DUMP_STACK_SRC.format(ws=word_size, ec=ec, wc=wc, endianness=endianness)
+        ns = {'struct': struct, 'sys': sys, 'telescope_str': telescope_str,
+              '_unpack8': struct.Struct(f"{ec}8{wc}").unpack}
+        exec(src, ns)
+        fn = ns['_dump_stack']
+        _dump_stack_printers[key] = fn
+    return fn
+
+_ARCH_INFO = {
+        # arch_name: (bits, endianness)
+        "i386":    (32, "little"),
+        "x86_64":  (64, "little"),
+        "arm":     (32, "little"), # XXX add support for arm BE?
+        "aarch64": (64, "little"), # XXX add support for arm BE?
+        "ppc":     (32, "big"),
+        "mips":    (32, "big"),
+        "mipsel":  (32, "little"),
+        "mips64":  (64, "big"),
+        }
 
 class PandaArch():
     '''
@@ -29,52 +95,95 @@ class PandaArch():
         Mapping of register names to indices into the appropriate CPUState array
         '''
 
+        # Bits/endianness are invariant per architecture - compute once here
+        # instead of on every dump_stack call
+        self._bits = None
+        self._endianness = None
+        self._register_size = None
+        self._bits, self._endianness, self._register_size = self._determine_bits()
+        self._arg_sz = self._register_size # Size of a stack-passed argument
+
+        # Precomputed constants for unsigned->signed conversion so hot
+        # paths skip panda.from_unsigned_guest's attribute lookups
+        self._sign_bit = 1 << (self._bits - 1)
+        self._modulus = 1 << self._bits
+
+        self._dump_stack_impl = _make_dump_stack_printer(self._register_size, self._endianness)
+        self._finalize()
+
+    def _to_signed(self, val):
+        '''
+        Interpret an unsigned guest word as a signed value. Equivalent to
+        panda.from_unsigned_guest but uses the cached per-arch constants.
+        '''
+        return val - self._modulus if val >= self._sign_bit else val
+
+    def _finalize(self):
+        '''
+        Wire up every derived per-instance cache in one place: the frozen
+        register list, the resolved convention and retval tables, and the
+        pre-bound register accessors. Subclass __init__s call this after
+        populating self.registers, self.call_conventions and
+        self.reg_retval so all caches are built uniformly.
+        '''
+        assert (self.registers is not None), f"Missing registers for {type(self)}"
+
+        # Pre-bound read accessor: looking this up on the instance skips
+        # the class-dict lookup + method binding per call in get_args
+        self._read_reg = self._get_reg_val
+
+        # Resolve calling-convention location names into (kind, payload)
+        # pairs so get_arg/set_arg don't redo the name->index string work
+        # per call. Each entry is ('reg', register_index) for register
+        # args or ('stack', offset) for stack-based args
+        self._reg_list = tuple(self.registers.items())
+        self._reg_indices = tuple(self.registers.values())
+        self._conv_resolved = {}
+        self._retval_idx = {}
+        if self.reg_retval:
+            self._retval_idx = {conv: self.registers[name.upper()]
+                                for conv, name in self.reg_retval.items()}
+        if not self.call_conventions:
+            return
+        for conv, locs in self.call_conventions.items():
+            resolved = []
+            for name in locs:
+                idx = self.registers.get(name.upper())
+                if idx is not None:
+                    resolved.append(('reg', idx))
+                else:
+                    # Parse the stack_X offset once here. Malformed names
+                    # keep the string and fail at use time like they always have
+                    suffix = name[6:] if name.startswith("stack_") else None
+                    if suffix is not None and suffix.isdigit():
+                        resolved.append(('stack', int(suffix)))
+                    else:
+                        resolved.append(('stack', name))
+            self._conv_resolved[conv] = resolved
+
     def _determine_bits(self):
         '''
-        Determine bits and endianness for the panda object's architecture
-        '''
-        bits = None
-        endianness = None # String 'little' or 'big'
-        if self.panda.arch_name == "i386":
-            bits = 32
-            endianness = "little"
-        elif self.panda.arch_name == "x86_64":
-            bits = 64
-            endianness = "little"
-        elif self.panda.arch_name == "arm":
-            endianness = "little" # XXX add support for arm BE?
-            bits = 32
-        elif self.panda.arch_name == "aarch64":
-            bits = 64
-            endianness = "little" # XXX add support for arm BE?
-        elif self.panda.arch_name == "ppc":
-            bits = 32
-            endianness = "big"
-        elif self.panda.arch_name == "mips":
-            bits = 32
-            endianness = "big"
-        elif self.panda.arch_name == "mipsel":
-            bits = 32
-            endianness = "little"
-        elif self.panda.arch_name == "mips64":
-            bits = 64
-            endianness = "big"
+        Determine bits and endianness for the panda object's architecture.
+        The result is cached at init so subsequent calls are just a lookup.
+        '''
+        if self._bits is not None:
+            return self._bits, self._endianness, self._register_size
+
+        bits, endianness = _ARCH_INFO.get(self.panda.arch_name, (None, None))
 
         assert (bits is not None), f"Missing num_bits logic for {self.panda.arch_name}"
         assert (endianness is not None), f"Missing endianness logic for {self.panda.arch_name}"
-        register_size = int(bits/8)
-        return bits, endianness, register_size
+        return bits, endianness, bits // 8
 
     def get_reg(self, cpu, reg):
         '''
         Return value in a `reg` which is either a register name or index (e.g., "R0" or 0)
         '''
         if isinstance(reg, str):
-            reg = reg.upper()
-            if reg not in self.registers.keys():
-                raise ValueError(f"Invalid register name {reg}")
-            else:
-                reg = self.registers[reg]
+            idx = self.registers.get(reg.upper())
+            if idx is None:
+                raise ValueError(f"Invalid register name {reg.upper()}")
+            reg = idx
 
         return self._get_reg_val(cpu, reg)
 
@@ -84,16 +193,23 @@ class PandaArch():
         '''
         raise NotImplementedError()
 
+    def _get_reg_val_many(self, cpu, indices):
+        '''
+        Return the values of several registers given by index. Subclasses
+        overload this to resolve the underlying register array just once.
+        '''
+        read_reg = self._read_reg
+        return [read_reg(cpu, idx) for idx in indices]
+
     def set_reg(self, cpu, reg, val):
         '''
         Set register `reg` to a value where `reg` is either a register name or index (e.g., "R0" or 0)
         '''
         if isinstance(reg, str):
-            reg = reg.upper()
-            if reg not in self.registers.keys():
-                raise ValueError(f"Invalid register name {reg}")
-            else:
-                reg = self.registers[reg]
+            idx = self.registers.get(reg.upper())
+            if idx is None:
+                raise ValueError(f"Invalid register name {reg.upper()}")
+            reg = idx
         elif not isinstance(reg, int):
             raise ValueError(f"Can't set register {reg}")
 
@@ -125,6 +241,18 @@ class PandaArch():
             raise NotImplementedError(f"Unsupported argument number {idx}")
         raise NotImplementedError(f"Unsupported convention {convention} for {type(self)}")
 
+    def _get_arg_loc_resolved(self, idx, convention):
+        '''
+        Return the precomputed (kind, payload) entry for argument [idx]
+        with calling [convention]. See _finalize.
+        '''
+        locs = self._conv_resolved.get(convention)
+        if locs is None:
+            raise NotImplementedError(f"Unsupported convention {convention} for {type(self)}")
+        if idx >= len(locs):
+            raise NotImplementedError(f"Unsupported argument number {idx}")
+        return locs[idx]
+
     def _get_ret_val_reg(self, cpu, convention):
         if self.reg_retval and convention in self.reg_retval:
             return self.reg_retval[convention]
@@ -137,8 +265,10 @@ class PandaArch():
 
         Note for syscalls we define arg[0] as syscall number and then 1-index the actual args
         '''
-        reg = self._get_arg_loc(idx, convention)
-        return self.set_reg(cpu, reg, val)
+        kind, loc = self._get_arg_loc_resolved(idx, convention)
+        if kind == 'reg':
+            return self._set_reg_val(cpu, loc, val)
+        raise ValueError(f"Cannot set stack-based arg {idx} for {type(self)}")
 
     def get_arg(self, cpu, idx, convention='default'):
         '''
@@ -154,36 +284,35 @@ class PandaArch():
 
         Note for syscalls we define arg[0] as syscall number and then 1-index the actual args
         '''
-        
-        argloc = self._get_arg_loc(idx, convention)
 
-        if self._is_stack_loc(argloc):
-            return self._read_stack(cpu, argloc)
-        else:
-            return self.get_reg(cpu, argloc)
+        kind, loc = self._get_arg_loc_resolved(idx, convention)
+        if kind == 'reg':
+            return self._get_reg_val(cpu, loc)
+        if isinstance(loc, int):
+            return self._read_stack_idx(cpu, loc)
+        return self._read_stack(cpu, loc)
 
-    @staticmethod
-    def _is_stack_loc(argloc):
+    def _read_stack(self, cpu, argloc):
         '''
-        Given a name returned by self._get_arg_loc
-        check if it's the name of a stack offset
+        Given a name like stack_X, parse out X then defer to
+        _read_stack_idx. Kept for API compatibility - the resolved
+        convention tables store the offset directly.
+
+        May raise a ValueError if the memory read fails
         '''
-        return argloc.startswith("stack_")
+        assert(argloc.startswith("stack_")), f"Can't get stack offset of {argloc}"
+        return self._read_stack_idx(cpu, int(argloc[6:]))
 
-    def _read_stack(self, cpu, argloc):
+    def _read_stack_idx(self, cpu, stack_idx):
         '''
-        Given a name like stack_X, calculate where
-        the X-th value on the stack is, then read it out of
-        memory and return it.
+        Calculate where the stack_idx-th value on the stack is, then
+        read it out of memory and return it.
 
         May raise a ValueError if the memory read fails
         '''
         # Stack based - get stack base, calculate offset, then try to read it
-        assert(self._is_stack_loc(argloc)), f"Can't get stack offset of {argloc}"
-
-        stack_idx = int(argloc.split("stack_")[1])
-        stack_base = self.get_reg(cpu, self.reg_sp)
-        arg_sz = self.panda.bits // 8
+        stack_base = self._get_reg_val(cpu, self.reg_sp)
+        arg_sz = self._arg_sz
         offset = arg_sz * (stack_idx+1)
         return self.panda.virtual_memory_read(cpu, stack_base + offset, arg_sz, fmt='int')
 
@@ -199,8 +328,10 @@ class PandaArch():
         Note the failure argument only used by subclasses that overload this function. It's provided
         in the signature here so it can be set by a caller without regard for the guest architecture.
         '''
-        reg = self._get_ret_val_reg(cpu, convention)
-        return self.set_reg(cpu, reg, val)
+        idx = self._retval_idx.get(convention)
+        if idx is None:
+            raise NotImplementedError(f"Unsupported set_retval for architecture {type(self)} {convention}")
+        return self._set_reg_val(cpu, idx, val)
 
     def get_retval(self, cpu, convention='default'):
         '''
@@ -210,11 +341,13 @@ class PandaArch():
 
         Return value from syscalls is signed
         '''
-        reg = self._get_ret_val_reg(cpu, convention)
-        rv = self.get_reg(cpu, reg)
+        idx = self._retval_idx.get(convention)
+        if idx is None:
+            raise NotImplementedError(f"Unsupported get_retval for architecture {type(self)} {convention}")
+        rv = self._get_reg_val(cpu, idx)
 
         if convention == 'syscall':
-            rv = self.panda.from_unsigned_guest(rv)
+            rv = self._to_signed(rv)
         return rv
 
 
@@ -231,33 +364,18 @@ class PandaArch():
         '''
         Print (telescoping) each register and its values
         '''
-        for (regname, reg) in self.registers.items():
-            val = self.get_reg(cpu, reg)
-            print("{}: 0x{:x}".format(regname, val), end="\t")
-            telescope(self.panda, cpu, val)
+        parts = []
+        vals = self._get_reg_val_many(cpu, self._reg_indices)
+        for (regname, _), val in zip(self._reg_list, vals):
+            parts.append("{}: 0x{:x}\t{}".format(regname, val,
+                         telescope_str(self.panda, cpu, val)))
+        sys.stdout.write("".join(parts))
 
     def dump_stack(self, cpu, words=8):
         '''
         Print (telescoping) most recent `words` words on the stack (from stack pointer to stack pointer + `words`*word_size)
         '''
-
-        base_reg_s = "SP"
-        base_reg_val = self.get_reg(cpu, self.reg_sp)
-        if base_reg_val == 0:
-            print("[WARNING: no stack pointer]")
-            return
-        word_size = int(self.panda.bits/8)
-
-        _, endianness, _ = self._determine_bits()
-
-        for word_idx in range(words):
-            try:
-                val_b = self.panda.virtual_memory_read(cpu, base_reg_val+word_idx*word_size, word_size)
-                val = int.from_bytes(val_b, byteorder=endianness)
-                print("[{}+0x{:0>2x}] == 0x{:0<8x}]: 0x{:0<8x}".format(base_reg_s, word_idx*word_size, base_reg_val+word_idx*word_size, val), end="\t")
-                telescope(self.panda, cpu, val)
-            except ValueError:
-                print("[{}+0x{:0>2x}] == [memory read error]".format(base_reg_s, word_idx*word_size))
+        return self._dump_stack_impl(self, cpu, words)
 
     def dump_state(self, cpu):
         """
@@ -270,33 +388,76 @@ class PandaArch():
         self.dump_stack(cpu)
 
     def get_args(self, cpu, num, convention='default'):
-        return [self.get_arg(cpu,i, convention) for i in range(num)]
+        '''
+        Return the first [num] args for the given calling convention.
+        Iterates the resolved convention table directly and reads the
+        stack pointer at most once however many args are stack-based.
+        '''
+        locs = self._conv_resolved.get(convention)
+        if locs is None:
+            raise NotImplementedError(f"Unsupported convention {convention} for {type(self)}")
+        if num > len(locs):
+            raise NotImplementedError(f"Unsupported argument number {num-1}")
+
+        read_reg = self._read_reg
+        memory_read = self.panda.virtual_memory_read
+        arg_sz = self._arg_sz
+        stack_base = None
+        out = []
+        for kind, loc in locs[:num]:
+            if kind == 'reg':
+                out.append(read_reg(cpu, loc))
+            elif isinstance(loc, int):
+                if stack_base is None:
+                    stack_base = read_reg(cpu, self.reg_sp)
+                out.append(memory_read(cpu, stack_base + arg_sz*(loc+1), arg_sz, fmt='int'))
+            else:
+                out.append(self._read_stack(cpu, loc))
+        return out
 
 class ArmArch(PandaArch):
     '''
     Register names and accessors for ARM
     '''
+    # r15 is the program counter in QEMU's ARM CPUARMState.regs. Note the
+    # intra-procedure scratch register (IP) is r12, which already appears
+    # here as R12
+    _REGNAMES = ("R0", "R1", "R2", "R3", "R4", "R5", "R6", "R7",
+                 "R8", "R9", "R10", "R11", "R12", "SP", "LR", "PC")
+    _REGISTERS = {name: idx for idx, name in enumerate(_REGNAMES)}
+    """Register array for ARM"""
+
+    _CALL_CONVENTIONS = {"arm32":         ["R0", "R1", "R2", "R3"],
+                         "syscall": ["R7", "R0", "R1", "R2", "R3", "R4", "R5"], # EABI
+                         }
+    _CALL_CONVENTIONS['default'] = _CALL_CONVENTIONS['arm32']
+
+    _REG_RETVAL = {"default":    "R0",
+                   "syscall":    "R0"}
+
     def __init__(self, panda):
         PandaArch.__init__(self, panda)
-        regnames = ["R0", "R1", "R2", "R3", "R4", "R5", "R6", "R7",
-                    "R8", "R9", "R10", "R11", "R12", "SP", "LR", "IP"]
-        self.registers = {regnames[idx]: idx for idx in range(len(regnames)) }
-        """Register array for ARM"""
-
-        self.reg_sp      = regnames.index("SP")
-        self.reg_pc      = regnames.index("IP")
-        self.reg_retaddr = regnames.index("LR")
-
-        self.reg_sp = regnames.index("SP")
-        self.reg_retaddr = regnames.index("LR")
-        self.call_conventions = {"arm32":         ["R0", "R1", "R2", "R3"],
-                                 "syscall": ["R7", "R0", "R1", "R2", "R3", "R4", "R5"], # EABI
-                                 }
-        self.call_conventions['default'] = self.call_conventions['arm32']
-
-        self.reg_retval = {"default":    "R0",
-                           "syscall":    "R0"}
-        self.reg_pc = regnames.index("IP")
+        self.registers = self._REGISTERS
+
+        self.reg_sp      = self._REGISTERS["SP"]
+        self.reg_pc      = self._REGISTERS["PC"]
+        self.reg_retaddr = self._REGISTERS["LR"]
+
+        self.call_conventions = self._CALL_CONVENTIONS
+        self.reg_retval = self._REG_RETVAL
+        self._finalize()
+
+    def get_pc(self, cpu):
+        '''
+        Overloaded function to return the ARM program counter (r15)
+        '''
+        return cpu.env_ptr.regs[15]
+
+    def set_pc(self, cpu, val):
+        '''
+        Overloaded function to set the ARM program counter (r15)
+        '''
+        cpu.env_ptr.regs[15] = val
 
     def _get_reg_val(self, cpu, reg):
         '''
@@ -304,6 +465,13 @@ class ArmArch(PandaArch):
         '''
         return cpu.env_ptr.regs[reg]
 
+    def _get_reg_val_many(self, cpu, indices):
+        '''
+        Bulk-read arm registers, resolving the register array once
+        '''
+        regs = cpu.env_ptr.regs
+        return [regs[idx] for idx in indices]
+
     def _set_reg_val(self, cpu, reg, val):
         '''
         Set an arm register
@@ -326,29 +494,31 @@ class Aarch64Arch(PandaArch):
     '''
     Register names and accessors for ARM64 (Aarch64)
     '''
-    def __init__(self, panda):
-        PandaArch.__init__(self, panda)
-
-        regnames = ["X0",  "X1",  "X2",  "X3",  "X4",  "X5", "X6", "X7",
-                    "XR",  "X9",  "X10", "X11", "X12", "X13", "X14",
-                    "X15", "IP0", "IP1", "PR", "X19", "X20", "X21",
-                    "X22", "X23", "X24", "X25", "X26", "X27", "X27",
-                    "X28", "FP", "LR", "SP"]
+    _REGNAMES = ("X0",  "X1",  "X2",  "X3",  "X4",  "X5", "X6", "X7",
+                 "XR",  "X9",  "X10", "X11", "X12", "X13", "X14",
+                 "X15", "IP0", "IP1", "PR", "X19", "X20", "X21",
+                 "X22", "X23", "X24", "X25", "X26", "X27",
+                 "X28", "FP", "LR", "SP")
+    _REGISTERS = {name: idx for idx, name in enumerate(_REGNAMES)}
+    """Register array for ARM64"""
 
-        self.reg_sp = regnames.index("SP")
+    _CALL_CONVENTIONS = {"arm64":         ["X0", "X1", "X2", "X3", "X4", "X5", "X6", "X7"],
+                         "syscall": ["XR", "X0", "X1", "X2", "X3", "X4", "X5", "X6", "X7"]}
+    _CALL_CONVENTIONS['default'] = _CALL_CONVENTIONS['arm64']
 
-        self.registers = {regnames[idx]: idx for idx in range(len(regnames)) }
-        """Register array for ARM"""
+    _REG_RETVAL = {"default":    "X0",
+                   "syscall":    "X0"}
 
-        self.reg_sp = regnames.index("SP")
-        self.reg_retaddr = regnames.index("LR")
+    def __init__(self, panda):
+        PandaArch.__init__(self, panda)
+        self.registers = self._REGISTERS
 
-        self.call_conventions = {"arm64":         ["X0", "X1", "X2", "X3", "X4", "X5", "X6", "X7"],
-                                 "syscall": ["XR", "X0", "X1", "X2", "X3", "X4", "X5", "X6", "X7"]}
-        self.call_conventions['default'] = self.call_conventions['arm64']
+        self.reg_sp = self._REGISTERS["SP"]
+        self.reg_retaddr = self._REGISTERS["LR"]
 
-        self.reg_retval = {"default":    "X0",
-                           "syscall":    "X0"}
+        self.call_conventions = self._CALL_CONVENTIONS
+        self.reg_retval = self._REG_RETVAL
+        self._finalize()
 
     def get_pc(self, cpu):
         '''
@@ -367,12 +537,14 @@ class Aarch64Arch(PandaArch):
         '''
         Return an aarch64 register
         '''
+        return cpu.env_ptr.xregs[reg]
 
-        if reg == 32:
-            print("WARNING: unsupported get sp for aarch64")
-            return 0
-        else:
-            return cpu.env_ptr.xregs[reg]
+    def _get_reg_val_many(self, cpu, indices):
+        '''
+        Bulk-read aarch64 registers, resolving the register array once
+        '''
+        xregs = cpu.env_ptr.xregs
+        return [xregs[idx] for idx in indices]
 
     def _set_reg_val(self, cpu, reg, val):
         '''
@@ -414,26 +586,36 @@ class MipsArch(PandaArch):
     $31	        $ra	Return Address
     '''
 
-    def __init__(self, panda):
-        super().__init__(panda)
-        regnames = ['zero', 'at', 'v0', 'v1', 'a0', 'a1', 'a2', 'a3',
-                    't0', 't1', 't2', 't3', 't4', 't5', 't6', 't7',
-                    's0', 's1', 's2', 's3', 's4', 's5', 's6', 's7',
-                    't8', 't9', 'k0', 'k1', 'gp', 'sp', 'fp', 'ra']
+    _REGNAMES = ('zero', 'at', 'v0', 'v1', 'a0', 'a1', 'a2', 'a3',
+                 't0', 't1', 't2', 't3', 't4', 't5', 't6', 't7',
+                 's0', 's1', 's2', 's3', 's4', 's5', 's6', 's7',
+                 't8', 't9', 'k0', 'k1', 'gp', 'sp', 'fp', 'ra')
 
-        self.reg_sp = regnames.index('sp')
-        self.reg_retaddr = regnames.index("ra")
-        # Default syscall/args are for mips o32
-        self.call_conventions = {"mips":          ["A0", "A1", "A2", "A3"],
-                                 "syscall": ["V0", "A0", "A1", "A2", "A3", "stack_1", "stack_2", "stack_3", "stack_4"]}
-        self.call_conventions['default'] = self.call_conventions['mips']
+    # note names must be stored uppercase for get/set reg to work case-insensitively
+    _REGISTERS = {name.upper(): idx for idx, name in enumerate(_REGNAMES)}
 
-        self.reg_retval =  {"default":    "V0",
-                            "syscall":    'V0'}
+    # Default syscall/args are for mips o32
+    _CALL_CONVENTIONS = {"mips":          ["A0", "A1", "A2", "A3"],
+                         "syscall": ["V0", "A0", "A1", "A2", "A3", "stack_1", "stack_2", "stack_3", "stack_4"]}
+    _CALL_CONVENTIONS['default'] = _CALL_CONVENTIONS['mips']
+
+    _REG_RETVAL =  {"default":    "V0",
+                    "syscall":    'V0'}
+
+    def __init__(self, panda):
+        super().__init__(panda)
 
+        self.reg_sp = self._REGISTERS['SP']
+        self.reg_retaddr = self._REGISTERS["RA"]
+        self.call_conventions = self._CALL_CONVENTIONS
+        self.reg_retval = self._REG_RETVAL
+        self.registers = self._REGISTERS
+        self._finalize()
 
-        # note names must be stored uppercase for get/set reg to work case-insensitively
-        self.registers = {regnames[idx].upper(): idx for idx in range(len(regnames)) }
+        # get_retval/set_retval read V0 and A3 on every syscall - cache
+        # their indices so those paths skip name resolution entirely
+        self._v0_idx = self._REGISTERS['V0']
+        self._a3_idx = self._REGISTERS['A3']
 
     def get_pc(self, cpu):
         '''
@@ -456,11 +638,12 @@ class MipsArch(PandaArch):
         on error)
         '''
 
-        flip = 1
-        if convention == 'syscall' and self.get_reg(cpu, "A3") == 1:
-            flip = -1
-
-        return flip * super().get_retval(cpu)
+        rv = self._get_reg_val(cpu, self._v0_idx)
+        if convention == 'syscall':
+            rv = self._to_signed(rv)
+            if self._get_reg_val(cpu, self._a3_idx) == 1:
+                rv = -rv
+        return rv
 
 
     def _get_reg_val(self, cpu, reg):
@@ -469,6 +652,13 @@ class MipsArch(PandaArch):
         '''
         return cpu.env_ptr.active_tc.gpr[reg]
 
+    def _get_reg_val_many(self, cpu, indices):
+        '''
+        Bulk-read mips registers, resolving the register array once
+        '''
+        gpr = cpu.env_ptr.active_tc.gpr
+        return [gpr[idx] for idx in indices]
+
     def _set_reg_val(self, cpu, reg, val):
         '''
         Set a mips register
@@ -503,16 +693,20 @@ class MipsArch(PandaArch):
         otherwise it will be set to 1
 
         '''
+        idx = self._retval_idx.get(convention)
+        if idx is None:
+            raise NotImplementedError(f"Unsupported set_retval for architecture {type(self)} {convention}")
+
         if convention == 'syscall':
             # Set A3 register to indicate syscall success/failure
-            self.set_reg(cpu, 'a3', failure)
+            self._set_reg_val(cpu, self._a3_idx, failure)
 
             # If caller is trying to indicate error by setting a negative retval
             # for a syscall, just make it positive with A3=1
-            if failure and self.panda.from_unsigned_guest(val) < 0:
-                val = -1 * self.panda.from_unsigned_guest(val)
+            if failure and self._to_signed(val) < 0:
+                val = -1 * self._to_signed(val)
 
-        return super().set_retval(cpu, val, convention)
+        return self._set_reg_val(cpu, idx, val)
 
 class Mips64Arch(MipsArch):
     '''
@@ -520,48 +714,50 @@ class Mips64Arch(MipsArch):
     except the register name and call conventions.
     '''
 
-    def __init__(self, panda):
-        super().__init__(panda)
-        regnames = ["zero", "at",   "v0",   "v1",   "a0",   "a1",   "a2",   "a3",
-                    "a4",   "a5",   "a6",   "a7",   "t0",   "t1",   "t2",   "t3",
-                    "s0",   "s1",   "s2",   "s3",   "s4",   "s5",   "s6",   "s7",
-                    "t8",   "t9",   "k0",   "k1",   "gp",   "sp",   "s8",   "ra"]
+    _REGNAMES = ("zero", "at",   "v0",   "v1",   "a0",   "a1",   "a2",   "a3",
+                 "a4",   "a5",   "a6",   "a7",   "t0",   "t1",   "t2",   "t3",
+                 "s0",   "s1",   "s2",   "s3",   "s4",   "s5",   "s6",   "s7",
+                 "t8",   "t9",   "k0",   "k1",   "gp",   "sp",   "s8",   "ra")
 
-        self.reg_sp = regnames.index('sp')
-        self.reg_retaddr = regnames.index("ra")
-        # Default syscall/args are for mips 64/n32 - note the registers are different than 32
-        self.call_conventions = {"mips":          ["A0", "A1", "A2", "A3"], # XXX Unsure?
-                                 "syscall": ["V0", "A0", "A1", "A2", "A3", "A4", "A5"]}
-        self.call_conventions['default'] = self.call_conventions['mips']
+    # note names must be stored uppercase for get/set reg to work case-insensitively
+    _REGISTERS = {name.upper(): idx for idx, name in enumerate(_REGNAMES)}
 
-        self.reg_retval =  {"default":    "V0",
-                            "syscall":    'V0'}
+    # Default syscall/args are for mips 64/n32 - note the registers are different than 32
+    _CALL_CONVENTIONS = {"mips":          ["A0", "A1", "A2", "A3"], # XXX Unsure?
+                         "syscall": ["V0", "A0", "A1", "A2", "A3", "A4", "A5"]}
+    _CALL_CONVENTIONS['default'] = _CALL_CONVENTIONS['mips']
 
+    _REG_RETVAL =  {"default":    "V0",
+                    "syscall":    'V0'}
 
-        # note names must be stored uppercase for get/set reg to work case-insensitively
-        self.registers = {regnames[idx].upper(): idx for idx in range(len(regnames)) }
+    # MipsArch.__init__ reads the class-level tables through self, so no
+    # overload is needed here
 
 class X86Arch(PandaArch):
     '''
     Register names and accessors for x86
     '''
 
+    _REGNAMES = ('EAX', 'ECX', 'EDX', 'EBX', 'ESP', 'EBP', 'ESI', 'EDI')
+    # XXX Note order is A C D B, because that's how qemu does it . See target/i386/cpu.h
+    _REGISTERS = {name: idx for idx, name in enumerate(_REGNAMES)}
+
+    _CALL_CONVENTIONS = {"cdecl": [f"stack_{x}" for x in range(20)], # 20: arbitrary but big
+                         "syscall": ["EAX", "EBX", "ECX", "EDX", "ESI", "EDI", "EBP"]}
+    _CALL_CONVENTIONS['default'] = _CALL_CONVENTIONS['cdecl']
+    assert all(s.startswith('stack_') and s[6:].isdigit() for s in _CALL_CONVENTIONS['cdecl'])
+
+    _REG_RETVAL = {"default":    "EAX",
+                   "syscall":    "EAX"}
+
     def __init__(self, panda):
         super().__init__(panda)
-        regnames = ['EAX', 'ECX', 'EDX', 'EBX', 'ESP', 'EBP', 'ESI', 'EDI']
-        # XXX Note order is A C D B, because that's how qemu does it . See target/i386/cpu.h
-
-        # Note we don't set self.call_conventions because stack-based arg get/set is
-        # not yet supported
-        self.reg_retval = {"default":    "EAX",
-                           "syscall":    "EAX"}
-        
-        self.call_conventions = {"cdecl": ["stack_{x}" for x in range(20)], # 20: arbitrary but big
-                                 "syscall": ["EAX", "EBX", "ECX", "EDX", "ESI", "EDI", "EBP"]}
-        self.call_conventions['default'] = self.call_conventions['cdecl']
 
-        self.reg_sp = regnames.index('ESP')
-        self.registers = {regnames[idx]: idx for idx in range(len(regnames)) }
+        self.reg_retval = self._REG_RETVAL
+        self.call_conventions = self._CALL_CONVENTIONS
+        self.reg_sp = self._REGISTERS['ESP']
+        self.registers = self._REGISTERS
+        self._finalize()
 
 
     def get_pc(self, cpu):
@@ -582,6 +778,13 @@ class X86Arch(PandaArch):
         '''
         return cpu.env_ptr.regs[reg]
 
+    def _get_reg_val_many(self, cpu, indices):
+        '''
+        Bulk-read x86 registers, resolving the register array once
+        '''
+        regs = cpu.env_ptr.regs
+        return [regs[idx] for idx in indices]
+
     def _set_reg_val(self, cpu, reg, val):
         '''
         Set an x86 register
@@ -606,24 +809,28 @@ class X86_64Arch(PandaArch):
     Register names and accessors for x86_64
     '''
 
-    def __init__(self, panda):
-        super().__init__(panda)
-        # The only place I could find the R_ names is in tcg/i386/tcg-target.h:50
-        regnames = ['RAX', 'RCX', 'RDX', 'RBX', 'RSP', 'RBP', 'RSI', 'RDI',
-                    'R8', 'R9', 'R10', 'R11', 'R12', 'R13', 'R14', 'R15']
-        # XXX Note order is A C D B, because that's how qemu does it
+    # The only place I could find the R_ names is in tcg/i386/tcg-target.h:50
+    _REGNAMES = ('RAX', 'RCX', 'RDX', 'RBX', 'RSP', 'RBP', 'RSI', 'RDI',
+                 'R8', 'R9', 'R10', 'R11', 'R12', 'R13', 'R14', 'R15')
+    # XXX Note order is A C D B, because that's how qemu does it
+    _REGISTERS = {name: idx for idx, name in enumerate(_REGNAMES)}
 
-        self.call_conventions = {'sysv':           ['RDI', 'RSI', 'RDX', 'RCX', 'R8', 'R9'],
-                                 'syscall': ['RAX', 'RDI', 'RSI', 'RDX', 'R10', 'R8', 'R9']}
+    _CALL_CONVENTIONS = {'sysv':           ['RDI', 'RSI', 'RDX', 'RCX', 'R8', 'R9'],
+                         'syscall': ['RAX', 'RDI', 'RSI', 'RDX', 'R10', 'R8', 'R9']}
+    _CALL_CONVENTIONS['default'] = _CALL_CONVENTIONS['sysv']
 
-        self.call_conventions['default'] = self.call_conventions['sysv']
+    _REG_RETVAL = {'sysv': 'RAX',
+                   'syscall': 'RAX'}
+    _REG_RETVAL['default'] = _REG_RETVAL['sysv']
 
-        self.reg_sp = regnames.index('RSP')
-        self.reg_retval = {'sysv': 'RAX',
-                           'syscall': 'RAX'}
-        self.reg_retval['default'] = self.reg_retval['sysv']
+    def __init__(self, panda):
+        super().__init__(panda)
 
-        self.registers = {regnames[idx]: idx for idx in range(len(regnames)) }
+        self.call_conventions = self._CALL_CONVENTIONS
+        self.reg_sp = self._REGISTERS['RSP']
+        self.reg_retval = self._REG_RETVAL
+        self.registers = self._REGISTERS
+        self._finalize()
 
     def get_pc(self, cpu):
         '''
@@ -643,6 +850,13 @@ class X86_64Arch(PandaArch):
         '''
         return cpu.env_ptr.regs[reg]
 
+    def _get_reg_val_many(self, cpu, indices):
+        '''
+        Bulk-read x86_64 registers, resolving the register array once
+        '''
+        regs = cpu.env_ptr.regs
+        return [regs[idx] for idx in indices]
+
     def _set_reg_val(self, cpu, reg, val):
         '''
         Set an x86_64 register
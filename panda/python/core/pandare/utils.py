@@ -41,30 +41,34 @@ def make_iso(directory, iso_path):
         else:
             raise NotImplementedError("Unsupported operating system!")
 
-def telescope(panda, cpu, val):
+def telescope_str(panda, cpu, val):
     '''
     Given a value, check if it's a pointer by seeing if we can map it to physical memory.
-    If so, recursively print where it points
+    If so, recursively describe where it points
     to until
-    1) It points to a string (then print the string)
+    1) It points to a string (then append the string)
     2) It's code (then disassembly the insn)
     3) It's an invalid pointer
     4) It's the 5th time we've done this, break
 
+    Returns the newline-terminated description as a string so callers
+    can batch output instead of printing per value.
+
     TODO Should use memory protections to determine string/code/data
     '''
+    parts = []
     for _ in range(5): # Max chain of 5
-        print("-> 0x{:0>8x}".format(val), end="\t")
+        parts.append("-> 0x{:0>8x}\t".format(val))
 
         if val == 0:
-            print()
-            return
+            parts.append("\n")
+            return "".join(parts)
         # Consider that val points to a string. Test and print
         try:
             str_data = panda.virtual_memory_read(cpu, val, 16)
         except ValueError:
-            print()
-            return
+            parts.append("\n")
+            return "".join(parts)
 
         str_val = ""
         for d in str_data:
@@ -73,14 +77,21 @@ def telescope(panda, cpu, val):
             else:
                 break
         if len(str_val) > 2:
-            print("== \"{}\"".format(str_val))
-            return
+            parts.append("== \"{}\"\n".format(str_val))
+            return "".join(parts)
 
 
         data = str_data[:4] # Truncate to 4 bytes
         val = int.from_bytes(data, byteorder='little')
 
-    print("-> ...")
+    parts.append("-> ...\n")
+    return "".join(parts)
+
+def telescope(panda, cpu, val):
+    '''
+    Print the telescoped description of val. See telescope_str.
+    '''
+    print(telescope_str(panda, cpu, val), end="")
 
 def blocking(func):
     """
@@ -3,12 +3,90 @@
 import os
 import re
 import sys
+import filecmp
 import textwrap
+import functools
 import pycparser
 import subprocess
+import concurrent.futures
 
 KNOWN_TYPES = ['bool', 'int', 'double', 'float', 'char', 'short', 'long', 'uint8_t', 'uint16_t', 'uint32_t', 'uint64_t']
-PROTOTYPE_RE = re.compile('^([^(]+)\((.*)\)\s*\;')
+# matches a simple prototype "rtype name(args);" and carves out the
+# three pieces directly.  typedefs are rejected by the lookahead, and an
+# optional trailing __attribute__((...)) is consumed and discarded.
+# note that fn-ptr declarators like "extern bool (*var)(int);" still
+# match, with name bound to the last rtype word and the ")(" declarator
+# spilling into args - split_fun_groups discards those by checking the
+# args group for balanced parens.
+PROTOTYPE_RE = re.compile(
+    r'^(?!\s*typedef\b)(?P<rtype>[\w \t*]+?[ \t*])(?P<name>[A-Za-z_]\w*)[ \t]*'
+    r'\((?P<args>[^;]*?)\)\s*'
+    r'(?:__attribute__\s*\(\([^)]*\)\)[ \t]*)*;', re.MULTILINE)
+
+# Output templates, dedented once at import rather than per function /
+# per generate_code call
+HEADER_TMPL = textwrap.dedent("""\
+    #ifndef __{0}_EXT_H__
+    #define __{0}_EXT_H__
+    /*
+     * DO NOT MODIFY. This file is automatically generated by scripts/apigen.py,
+     * based on the <plugin>_int.h file in your plugin directory.
+     *
+     * Note: Function pointers for API calls are declared as extern.
+     * The definition of the pointers is guarded by the PLUGIN_MAIN macro.
+     * This plugin is defined only for the compilation unit matching the
+     * name of the plugin.
+     * This allows us to initialize API function pointers once, in the main
+     * compilation unit, rather than in every compilation unit.
+     */
+    #include <dlfcn.h>
+    #include "panda/plugin.h"
+""")
+
+FN_TMPL = textwrap.dedent("""
+    typedef {rtype}(*{name}_t)({args_with_types});
+    extern {name}_t __{name};
+    #ifdef PLUGIN_MAIN
+    {name}_t __{name} = NULL;
+    #endif
+    static inline __attribute__((always_inline)) {rtype} {name}({args_with_types});
+    static inline __attribute__((always_inline)) {rtype} {name}({args_with_types}) {{
+    #ifndef NDEBUG
+        assert(__{name});
+    #endif
+        return __{name}({args});
+    }}
+""")
+
+FOOTER_TMPL = textwrap.dedent("""
+    bool init_{0}_api(void);
+
+    #ifdef PLUGIN_MAIN
+    #define API_PLUGIN_NAME "{0}"
+    #define IMPORT_PPP(module, func_name) {{ \\
+        __##func_name = (func_name##_t) dlsym(module, #func_name); \\
+        char *err = dlerror(); \\
+        if (err) {{ \\
+            printf("Couldn't find %s function in library %s.\\n", #func_name, API_PLUGIN_NAME); \\
+            printf("Error: %s\\n", err); \\
+            return false; \\
+        }} \\
+    }}
+    bool init_{0}_api(void) {{
+        void *module = panda_get_plugin_by_name(API_PLUGIN_NAME);
+        if (!module) {{
+            fprintf(stderr, "Couldn't load %s plugin: %s\\n", API_PLUGIN_NAME, dlerror());
+            return false;
+        }}
+        {1}
+        return true;
+    }}
+    #undef API_PLUGIN_NAME
+    #undef IMPORT_PPP
+    #endif
+
+    #endif
+""")
 
 # input is name of interface file.
 # output is list of args for that fn.
@@ -17,23 +95,85 @@ PROTOTYPE_RE = re.compile('^([^(]+)\((.*)\)\s*\;')
 # this will return
 # ["reg_num", "offset", "app", "stuff2"]
 #
+# constructing a CParser compiles/loads the PLY lex+yacc tables, which
+# is expensive - share one instance across calls in the same process
+@functools.lru_cache(maxsize=1)
+def _get_parser():
+    return pycparser.CParser()
+
+
 def get_arglists(pf):
-    pyc = pycparser.CParser()
+    pyc = _get_parser()
     p = pyc.parse(pf)
     args = {}
-    for (dc, d) in p.children():
-        if type(d) == pycparser.c_ast.Decl:
-            # a prototype
-            function_name = d.name
-            #print "function name = [%s]" % function_name
-            fundec = d.children()[0][1]
-            args[function_name] = []
-            for arg in fundec.args.params:
-                if not (arg.name is None):
-                    args[function_name].append(arg.name)
+    # walk p.ext directly - .children() builds fresh (name, node) tuple
+    # lists on every call
+    for d in p.ext:
+        if not isinstance(d, pycparser.c_ast.Decl):
+            continue
+        # a prototype - reach the FuncDecl through .type (unwrapping one
+        # level of PtrDecl for pointer-returning functions)
+        fundec = d.type
+        if isinstance(fundec, pycparser.c_ast.PtrDecl):
+            fundec = fundec.type
+        if not isinstance(fundec, pycparser.c_ast.FuncDecl):
+            continue
+        args[d.name] = [arg.name for arg in (fundec.args.params if fundec.args else ())
+                        if arg.name is not None]
     return args
 
 
+# trailing identifier of a parameter declaration, e.g. "stuff2" in
+# "void *stuff2" (with an optional array suffix)
+ARG_NAME_RE = re.compile(r'([A-Za-z_]\w*)\s*(\[[^\]]*\])?\s*$')
+# name of a function-pointer parameter, e.g. "app" in
+# "int (*app)(uint32_t el, void *stuff1)"
+FNPTR_NAME_RE = re.compile(r'\(\s*\*\s*([A-Za-z_]\w*)\s*\)')
+
+# tokens that can end an unnamed parameter declaration like "int" or
+# "unsigned long"
+TYPE_TOKENS = frozenset(KNOWN_TYPES) | frozenset(['void', 'signed', 'unsigned'])
+
+
+# split an argument list string at commas, ignoring commas nested inside
+# parentheses (function-pointer parameter lists)
+def split_args(args_str):
+    chunks = []
+    depth = 0
+    start = 0
+    for i, ch in enumerate(args_str):
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            chunks.append(args_str[start:i])
+            start = i + 1
+    chunks.append(args_str[start:])
+    return chunks
+
+
+# extract the argument names from the args portion of a prototype, i.e.
+# for "int reg_num, int (*app)(uint32_t el, void *stuff1), void *stuff2"
+# return ["reg_num", "app", "stuff2"].  This replaces a full pycparser
+# parse of the preprocessed translation unit, which dominated runtime.
+def extract_arg_names(args_str):
+    names = []
+    for chunk in split_args(args_str):
+        chunk = chunk.strip()
+        if not chunk or chunk == 'void' or chunk == '...':
+            continue
+        if '(' in chunk:
+            m = FNPTR_NAME_RE.search(chunk)
+            if m:
+                names.append(m.group(1))
+                continue
+        m = ARG_NAME_RE.search(chunk)
+        if m and m.group(1) not in TYPE_TOKENS: # unnamed params end in a type
+            names.append(m.group(1))
+    return names
+
+
 # prototype_line is a string containint a c function prototype.
 # all on one line.  has to end with a semi-colon.
 # return type has to be simple (better not return a fn ptr).
@@ -46,92 +186,54 @@ def split_fun_prototype(prototype_line):
     foo = PROTOTYPE_RE.search(prototype_line)
     if foo is None:
         return None
-    (a, fn_args_with_types) = foo.groups()
-    bar = a.split()
-    fn_name = bar[-1]
-    fn_type = " ".join(bar[0:-1])
-    # carve off ptrs from head of fn name
-    while fn_name[0] == '*':
-        fn_name = fn_name[1:]
-        fn_type = fn_type + " *"
-    return (fn_type, fn_name, fn_args_with_types)
-
-
-def generate_code(functions, module, includes):
-    code = textwrap.dedent("""\
-        #ifndef __{0}_EXT_H__
-        #define __{0}_EXT_H__
-        /*
-         * DO NOT MODIFY. This file is automatically generated by scripts/apigen.py,
-         * based on the <plugin>_int.h file in your plugin directory.
-         *
-         * Note: Function pointers for API calls are declared as extern.
-         * The definition of the pointers is guarded by the PLUGIN_MAIN macro.
-         * This plugin is defined only for the compilation unit matching the
-         * name of the plugin.
-         * This allows us to initialize API function pointers once, in the main
-         * compilation unit, rather than in every compilation unit.
-         */
-        #include <dlfcn.h>
-        #include "panda/plugin.h"
-    """).format(module.upper())
+    return split_fun_groups(foo)
+
+
+# every '(' in a parameter list must pair with a ')' before the closing
+# paren of the prototype; a stray declarator paren breaks that
+def _balanced_parens(s):
+    depth = 0
+    for ch in s:
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if depth < 0:
+                return False
+    return depth == 0
+
+
+# pulls (rtype, name, args_with_types) out of a PROTOTYPE_RE match,
+# normalizing the rtype's whitespace. Returns None for fn-ptr
+# declarators, whose ")(" leaks into the args group (see PROTOTYPE_RE)
+def split_fun_groups(m):
+    args = m['args']
+    if not _balanced_parens(args):
+        return None
+    fn_type = " ".join(m['rtype'].split())
+    return (fn_type, m['name'], args)
+
+
+def generate_code(functions, module, includes, out):
+    # write each rendered chunk straight to the output file rather than
+    # assembling the whole header in memory first
+    mod_up = module.upper()
+    out.write(HEADER_TMPL.format(mod_up))
 
     # convert function specs to maps
     fn_keys = ['rtype', 'name', 'args_with_types', 'args_list']
-    functions = [dict(list(zip(fn_keys, fn_spec))) for fn_spec in functions]
+    functions = [dict(zip(fn_keys, fn_spec)) for fn_spec in functions]
 
     for fn in functions:
         fn['args'] = ','.join(fn['args_list'])
+        out.write(FN_TMPL.format_map(fn))
 
-        code += textwrap.dedent("""
-            typedef {rtype}(*{name}_t)({args_with_types});
-            extern {name}_t __{name};
-            #ifdef PLUGIN_MAIN
-            {name}_t __{name} = NULL;
-            #endif
-            static inline {rtype} {name}({args_with_types});
-            static inline {rtype} {name}({args_with_types}) {{
-                assert(__{name});
-                return __{name}({args});
-            }}
-        """).format(**fn)
-
-    ppp_imports = "\n    ".join(['IMPORT_PPP(module, {name})'.format(**fn) for fn in functions])
-
-    code += textwrap.dedent("""
-        bool init_{0}_api(void);
-
-        #ifdef PLUGIN_MAIN
-        #define API_PLUGIN_NAME "{0}"
-        #define IMPORT_PPP(module, func_name) {{ \\
-            __##func_name = (func_name##_t) dlsym(module, #func_name); \\
-            char *err = dlerror(); \\
-            if (err) {{ \\
-                printf("Couldn't find %s function in library %s.\\n", #func_name, API_PLUGIN_NAME); \\
-                printf("Error: %s\\n", err); \\
-                return false; \\
-            }} \\
-        }}
-        bool init_{0}_api(void) {{
-            void *module = panda_get_plugin_by_name(API_PLUGIN_NAME);
-            if (!module) {{
-                fprintf(stderr, "Couldn't load %s plugin: %s\\n", API_PLUGIN_NAME, dlerror());
-                return false;
-            }}
-            {1}
-            return true;
-        }}
-        #undef API_PLUGIN_NAME
-        #undef IMPORT_PPP
-        #endif
-
-        #endif
-    """).format(module, ppp_imports)
+    ppp_imports = "\n    ".join(f'IMPORT_PPP(module, {fn["name"]})' for fn in functions)
 
-    return code
+    out.write(FOOTER_TMPL.format(module, ppp_imports))
 
-bad_keywords = ['static', 'inline']
-keep_keywords = ['const', 'unsigned']
+BAD_KEYWORDS = frozenset(['static', 'inline'])
+KEEP_KEYWORDS = frozenset(['const', 'unsigned'])
 def resolve_type(modifiers, name):
     modifiers = modifiers.strip()
     tokens = modifiers.split()
@@ -139,9 +241,9 @@ def resolve_type(modifiers, name):
         # we have to go through all the keywords we care about
         relevant = []
         for token in tokens[:-1]:
-            if token in keep_keywords:
+            if token in KEEP_KEYWORDS:
                 relevant.append(token)
-            if token in bad_keywords:
+            if token in BAD_KEYWORDS:
                 raise Exception("Invalid token in API function definition")
         relevant.append(tokens[-1])
         rtype = " ".join(relevant)
@@ -156,33 +258,47 @@ def generate_api(interface_file, ext_file, extra_gcc_args):
     functions = []
     includes = []
 
-    # use preprocessor
-    pf = subprocess.check_output(['gcc', '-E', interface_file] + extra_gcc_args).decode()
-
-    # use pycparser to get arglists
-    arglist = get_arglists(pf)
-
-    for line in pf.split("\n"):
-        line = line.strip();
-        if not line or line.startswith('#'):    # empty line or preprocessor directive
-            continue
-
-        # attempt to parse as function prototype
-        # if successful, a tuple of (rtype, fn_name, args_with_types) is returned
-        func_spec = split_fun_prototype(line)
+    # use preprocessor (-P strips the "# line" markers so the buffer is
+    # smaller). text=True decodes in the pipe reader rather than making
+    # a second full copy of the output with .decode()
+    pf = subprocess.run(['gcc', '-E', '-P', interface_file] + extra_gcc_args,
+                        check=True, stdout=subprocess.PIPE, text=True).stdout
 
+    # scan the whole buffer for prototypes in one multiline-regex pass
+    # rather than looping over (mostly uninteresting) lines in Python
+    for m in PROTOTYPE_RE.finditer(pf):
+        # a tuple of (rtype, fn_name, args_with_types, arg names)
+        func_spec = split_fun_groups(m)
         if func_spec is None:       # not a function prototype
             continue
-        else:                       # append argument names func_spec tuple
-            func_spec += (arglist[func_spec[1]],)
+        func_spec += (extract_arg_names(func_spec[2]),)
 
         functions.append(func_spec)
 
     # Plugin interface file will look like [...]/plugins/<name>/<name>_int.h
     plugin_name = os.path.basename(os.path.dirname(interface_file))
-    code = generate_code(functions, plugin_name, includes)
-    with open(ext_file,"w") as extAPI:
-        extAPI.write(code)
+    # write to a temp file and swap it in atomically, so an interrupted
+    # run never leaves a truncated header behind for make to pick up
+    tmp_file = ext_file + ".tmp"
+    with open(tmp_file,"w") as extAPI:
+        generate_code(functions, plugin_name, includes, extAPI)
+    if os.path.exists(ext_file) and filecmp.cmp(tmp_file, ext_file, shallow=False):
+        # unchanged - keep the old file (and its mtime) so everything
+        # compiled against the generated header isn't rebuilt
+        os.remove(tmp_file)
+    else:
+        os.replace(tmp_file, ext_file)
+
+# generate headers for several plugins at once. pairs is a list of
+# (interface_file, ext_file) tuples; each one is independent (its own
+# gcc -E run and output file), so fan out across cores with worker
+# processes instead of running them back to back.
+def generate_api_batch(pairs, extra_gcc_args):
+    worker = functools.partial(generate_api, extra_gcc_args=extra_gcc_args)
+    with concurrent.futures.ProcessPoolExecutor() as ex:
+        # drain the iterator so worker exceptions propagate here
+        for _ in ex.map(worker, *zip(*pairs)):
+            pass
 
 if __name__ == "__main__":
     if len(sys.argv) < 3: